@@ -1,18 +1,23 @@
 """FastAPI 德州扑克在线游戏 - 使用DDD架构"""
-import uuid
+import secrets
 from typing import Optional
 from contextlib import asynccontextmanager
 from urllib.parse import quote, unquote
 
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Request, Form, Cookie
-from fastapi.responses import HTMLResponse, RedirectResponse
+from fastapi.responses import HTMLResponse, RedirectResponse, Response
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 
 from src.domain.enums import BettingMode
+from src.core.config import settings
 from src.core.dependencies import get_game_service, get_connection_manager
 
 
+# 表单中的下注模式 -> BettingMode
+BETTING_MODES = {mode.value: mode for mode in BettingMode}
+
+
 # ============ FastAPI 应用 ============
 
 @asynccontextmanager
@@ -42,7 +47,7 @@ async def index(request: Request, player_id: Optional[str] = Cookie(None)):
 @app.post("/set-player")
 async def set_player(player_name: str = Form(...)):
     """设置玩家名称"""
-    player_id = str(uuid.uuid4())
+    player_id = secrets.token_hex(16)
     # URL编码支持中文名
     encoded_name = quote(player_name, safe='')
     response = RedirectResponse(url="/lobby", status_code=303)
@@ -90,12 +95,7 @@ async def create_room(
     # 解码中文名
     decoded_name = unquote(player_name)
 
-    mode_map = {
-        "limit": BettingMode.LIMIT,
-        "no_limit": BettingMode.NO_LIMIT,
-        "pot_limit": BettingMode.POT_LIMIT
-    }
-    mode = mode_map.get(betting_mode, BettingMode.NO_LIMIT)
+    mode = BETTING_MODES.get(betting_mode, BettingMode.NO_LIMIT)
 
     # 验证盲注参数
     small_blind = max(1, small_blind)
@@ -169,16 +169,18 @@ async def websocket_endpoint(websocket: WebSocket, room_id: str, player_id: str)
 
     try:
         # 发送初始状态
-        state = game_service.get_game_state_for_player(room_id, player_id)
-        if state:
-            await websocket.send_json({"type": "game_state", "data": state})
+        await game_service.send_game_state(room_id, player_id)
 
         # 广播玩家加入
         await game_service.broadcast_game_state(room_id)
 
         # 接收消息
         while True:
-            data = await websocket.receive_json()
+            try:
+                data = await websocket.receive_json()
+            except (ValueError, KeyError):
+                # 忽略无法解析的消息（二进制帧没有 text 字段，Starlette 抛 KeyError）
+                continue
             await game_service.handle_player_action(room_id, player_id, data)
 
     except WebSocketDisconnect:
@@ -192,7 +194,10 @@ async def websocket_endpoint(websocket: WebSocket, room_id: str, player_id: str)
 async def api_rooms():
     """获取房间列表 API"""
     game_service = get_game_service()
-    return game_service.get_room_list()
+    return Response(
+        content=game_service.get_room_list_json(),
+        media_type="application/json"
+    )
 
 
 @app.get("/api/room/{room_id}/state")
@@ -211,4 +216,11 @@ async def api_room_state(room_id: str, player_id: Optional[str] = Cookie(None)):
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run("app:app", host="0.0.0.0", port=8000, reload=True)
+    uvicorn.run(
+        "app:app",
+        host="0.0.0.0",
+        port=8000,
+        reload=True,
+        loop="auto" if settings.use_uvloop else "asyncio",
+        ws_per_message_deflate=settings.ws_per_message_deflate
+    )
@@ -1,19 +1,42 @@
 """游戏服务 - 协调领域层和基础设施层"""
 import asyncio
+import logging
 import time
+from collections import deque
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Any, Callable
+from itertools import islice
+from typing import Dict, List, Optional, Any, Callable, Deque, Set
 
-from src.domain.enums import BettingMode, GameStage, ActionType
+import orjson
+
+from src.domain.enums import BettingMode, GameStage, ActionType, NON_ACTION_STAGES
 from src.domain.models.poker_table import PokerTable
 from src.domain.models.player import Player
 from src.domain.services.hand_evaluator import HandEvaluator
-from src.infrastructure.communication import ConnectionManager
+from src.infrastructure.communication import ConnectionManager, to_json
 from src.infrastructure.storage import RoomStorage
 from src.core.config import settings
 
+logger = logging.getLogger(__name__)
+
+
+# 客户端可发送的操作及其可选参数的类型
+ACTION_FIELDS: Dict[str, Dict[str, type]] = {
+    "chat": {"content": str},
+    "start_game": {},
+    "fold": {},
+    "check": {},
+    "call": {},
+    "bet": {"amount": int},
+    "raise": {"amount": int},
+    "all_in": {},
+}
+
+# 发公共牌的阶段
+BOARD_STAGES = (GameStage.FLOP, GameStage.TURN, GameStage.RIVER)
+
 
-@dataclass
+@dataclass(slots=True)
 class ChatMessage:
     """聊天消息"""
     player_name: str
@@ -30,7 +53,7 @@ class ChatMessage:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class GameAction:
     """游戏操作记录"""
     player_name: str
@@ -57,13 +80,24 @@ class GameService:
         self.room_storage = room_storage
         self.connection_manager = connection_manager
 
-        # 聊天和操作历史
-        self.chat_history: Dict[str, List[ChatMessage]] = {}
-        self.action_history: Dict[str, List[GameAction]] = {}
+        # 聊天和操作历史（超出上限时自动丢弃最旧的记录）
+        self.chat_history: Dict[str, Deque[ChatMessage]] = {}
+        self.action_history: Dict[str, Deque[GameAction]] = {}
 
-        # 计时器
-        self.turn_timers: Dict[str, asyncio.Task] = {}
+        # 计时器: 各房间回合开始时间，由一个共享的检查任务统一处理超时
         self.turn_start_time: Dict[str, float] = {}
+        self._timer_task: Optional[asyncio.Task] = None
+        # 正在处理的超时弃牌任务（持有引用，防止任务被回收）
+        self._timeout_tasks: Set[asyncio.Task] = set()
+
+        # 等待下一轮事件循环执行的状态广播
+        self._pending_broadcasts: Dict[str, asyncio.Handle] = {}
+
+        # 房间摘要 room_id -> 摘要，人数或阶段变化时原地更新
+        self._room_summaries: Dict[str, dict] = {}
+        # 房间列表缓存，任一摘要变化时失效
+        self._room_list_cache: Optional[List[dict]] = None
+        self._room_list_json: Optional[bytes] = None
 
     # ============ 房间管理 ============
 
@@ -84,8 +118,16 @@ class GameService:
             ante=ante
         )
         self.room_storage.save(table)
-        self.chat_history[table.room_id] = []
-        self.action_history[table.room_id] = []
+        self.chat_history[table.room_id] = deque(maxlen=settings.max_chat_history)
+        self.action_history[table.room_id] = deque(maxlen=settings.max_action_history)
+        self._room_summaries[table.room_id] = {
+            "id": table.room_id,
+            "name": table.room_name,
+            "player_count": 0,
+            "stage": None,
+            "mode": table.betting_mode.display_name
+        }
+        self._update_room_summary(table)
         return table
 
     def get_room(self, room_id: str) -> Optional[PokerTable]:
@@ -94,17 +136,32 @@ class GameService:
 
     def get_room_list(self) -> List[dict]:
         """获取房间列表"""
-        rooms = self.room_storage.list_all()
-        return [
-            {
-                "id": r.room_id,
-                "name": r.room_name,
-                "player_count": len(r.players),
-                "stage": r.stage.value,
-                "mode": r.betting_mode.display_name
-            }
-            for r in rooms
-        ]
+        if self._room_list_cache is None:
+            self._room_list_cache = [dict(summary) for summary in self._room_summaries.values()]
+        return self._room_list_cache
+
+    def get_room_list_json(self) -> bytes:
+        """获取序列化后的房间列表"""
+        if self._room_list_json is None:
+            self._room_list_json = orjson.dumps(self.get_room_list())
+        return self._room_list_json
+
+    def _invalidate_room_list(self):
+        """房间列表缓存失效"""
+        self._room_list_cache = None
+        self._room_list_json = None
+
+    def _update_room_summary(self, table: PokerTable):
+        """同步房间摘要的人数和阶段，有变化时刷新房间列表"""
+        summary = self._room_summaries.get(table.room_id)
+        if summary is None:
+            return
+        player_count = len(table.players)
+        stage = table.stage.value
+        if summary["player_count"] != player_count or summary["stage"] != stage:
+            summary["player_count"] = player_count
+            summary["stage"] = stage
+            self._invalidate_room_list()
 
     def join_room(
         self,
@@ -117,17 +174,20 @@ class GameService:
         if not table:
             return False
 
-        return table.add_player(
+        joined = table.add_player(
             player_id=player_id,
             player_name=player_name,
             chips=settings.default_chips
         )
+        self._update_room_summary(table)
+        return joined
 
     def leave_room(self, room_id: str, player_id: str):
         """离开房间"""
         table = self.get_room(room_id)
         if table:
             table.remove_player(player_id)
+            self._update_room_summary(table)
             if len(table.players) == 0:
                 self.delete_room(room_id)
 
@@ -137,12 +197,21 @@ class GameService:
         self.chat_history.pop(room_id, None)
         self.action_history.pop(room_id, None)
         self._cancel_timer(room_id)
+        self._cancel_broadcast(room_id)
+        self._room_summaries.pop(room_id, None)
+        self._invalidate_room_list()
 
     # ============ 游戏流程 ============
 
-    async def start_game(self, room_id: str, player_id: str) -> bool:
-        """开始游戏"""
-        table = self.get_room(room_id)
+    async def start_game(
+        self,
+        room_id: str,
+        player_id: str,
+        table: Optional[PokerTable] = None
+    ) -> bool:
+        """开始游戏（调用方已取得牌桌时可直接传入）"""
+        if table is None:
+            table = self.get_room(room_id)
         if not table:
             return False
 
@@ -156,7 +225,7 @@ class GameService:
 
         # 开始新一手
         if table.start_new_hand():
-            self.action_history[room_id] = []
+            self.action_history[room_id] = deque(maxlen=settings.max_action_history)
             await self._start_turn_timer(room_id)
             await self.broadcast_chat(room_id, ChatMessage(
                 player_name="系统",
@@ -175,11 +244,14 @@ class GameService:
         action_data: dict
     ):
         """处理玩家操作"""
+        if not self._is_valid_action(action_data):
+            return
+
         table = self.get_room(room_id)
         if not table:
             return
 
-        action_type = action_data.get("action")
+        action_type = action_data["action"]
 
         # 聊天消息单独处理
         if action_type == "chat":
@@ -196,23 +268,38 @@ class GameService:
 
         # 开始游戏
         if action_type == "start_game":
-            await self.start_game(room_id, player_id)
+            await self.start_game(room_id, player_id, table)
             return
 
         # 游戏操作
-        await self._handle_game_action(room_id, player_id, action_type, action_data)
+        await self._handle_game_action(table, player_id, action_type, action_data)
+
+    @staticmethod
+    def _is_valid_action(action_data: Any) -> bool:
+        """校验客户端消息格式，不合法的消息直接忽略"""
+        if not isinstance(action_data, dict):
+            return False
+        action_type = action_data.get("action")
+        if not isinstance(action_type, str):
+            return False
+        fields = ACTION_FIELDS.get(action_type)
+        if fields is None:
+            return False
+        # 可选参数可以缺省，但出现时必须是声明的类型（null 同样拒绝）
+        for name, value_type in fields.items():
+            if name in action_data and type(action_data[name]) is not value_type:
+                return False
+        return True
 
     async def _handle_game_action(
         self,
-        room_id: str,
+        table: PokerTable,
         player_id: str,
         action_type: str,
         action_data: dict
     ):
         """处理游戏操作"""
-        table = self.get_room(room_id)
-        if not table:
-            return
+        room_id = table.room_id
 
         # 检查是否轮到该玩家
         current_player = table.get_current_player()
@@ -261,7 +348,7 @@ class GameService:
             table.last_raiser_index = current_player.position
 
             # 重置其他玩家的行动标记
-            self._reset_other_players_acted(table, current_player.id)
+            self._reset_other_players_acted(table, current_player.position)
 
             action_text = "下注"
             action_amount = actual
@@ -290,7 +377,7 @@ class GameService:
             table.raise_count += 1
             table.last_raiser_index = current_player.position
 
-            self._reset_other_players_acted(table, current_player.id)
+            self._reset_other_players_acted(table, current_player.position)
 
             action_text = "加注"
             action_amount = actual
@@ -307,7 +394,7 @@ class GameService:
                 table.last_raise_amount = raise_amount
                 table.raise_count += 1
                 table.last_raiser_index = current_player.position
-                self._reset_other_players_acted(table, current_player.id)
+                self._reset_other_players_acted(table, current_player.position)
 
             action_text = "全押"
             action_amount = actual
@@ -319,26 +406,25 @@ class GameService:
         # 检查游戏状态
         await self._check_game_state(room_id, table)
 
-    def _reset_other_players_acted(self, table: PokerTable, exclude_id: str):
-        """重置其他玩家的行动标记"""
+    def _reset_other_players_acted(self, table: PokerTable, exclude_position: int):
+        """重置其他玩家的行动标记（按座位号排除刚行动的玩家）"""
         for p in table.players:
-            if p.id != exclude_id and p.can_act():
+            if p.position != exclude_position and p.can_act():
                 p.has_acted = False
 
     async def _check_game_state(self, room_id: str, table: PokerTable):
         """检查并推进游戏状态"""
+        active_count, can_act_count, round_complete = table.scan_betting_state()
+
         # 检查是否只剩一个活跃玩家
-        active_players = table.get_active_players()
-        if len(active_players) == 1:
-            await self._handle_single_winner(room_id, table, active_players[0])
+        if active_count == 1:
+            await self._handle_single_winner(room_id, table, table.get_active_players()[0])
             return
 
         # 检查下注轮是否完成
-        if table.is_betting_round_complete():
-            players_can_act = table.get_players_can_act()
-
+        if round_complete:
             # 所有人都全押或只剩一人可行动
-            if len(players_can_act) <= 1:
+            if can_act_count <= 1:
                 await self._run_out_cards(room_id, table)
                 return
 
@@ -348,17 +434,8 @@ class GameService:
                 return
             else:
                 table.advance_stage()
-                stage_names = {
-                    GameStage.FLOP: "翻牌",
-                    GameStage.TURN: "转牌",
-                    GameStage.RIVER: "河牌"
-                }
-                if table.stage in stage_names:
-                    await self.broadcast_chat(room_id, ChatMessage(
-                        player_name="系统",
-                        content=f"进入{stage_names[table.stage]}阶段",
-                        msg_type="system"
-                    ))
+                if table.stage in BOARD_STAGES:
+                    await self._announce_stage(room_id, table.stage)
         else:
             # 移动到下一个玩家
             next_idx = table.get_next_active_player_index(table.current_player_index)
@@ -392,29 +469,31 @@ class GameService:
             msg_type="system"
         ))
         table.end_hand()
+        self._update_room_summary(table)
 
     async def _run_out_cards(self, room_id: str, table: PokerTable):
         """发完所有公共牌并摊牌"""
         self._cancel_timer(room_id)
+        delay = 0 if settings.runout_fast_mode else settings.runout_delay_seconds
 
-        while table.stage not in [GameStage.RIVER, GameStage.SHOWDOWN]:
+        while table.stage not in (GameStage.RIVER, GameStage.SHOWDOWN):
             table.advance_stage()
-            stage_names = {
-                GameStage.FLOP: "翻牌",
-                GameStage.TURN: "转牌",
-                GameStage.RIVER: "河牌"
-            }
-            if table.stage in stage_names:
-                await self.broadcast_chat(room_id, ChatMessage(
-                    player_name="系统",
-                    content=f"进入{stage_names[table.stage]}阶段",
-                    msg_type="system"
-                ))
+            if table.stage in BOARD_STAGES:
+                await self._announce_stage(room_id, table.stage)
                 await self.broadcast_game_state(room_id)
-                await asyncio.sleep(1)
+                if delay > 0:
+                    await asyncio.sleep(delay)
 
         await self._handle_showdown(room_id, table)
 
+    async def _announce_stage(self, room_id: str, stage: GameStage):
+        """发送进入新阶段的系统消息"""
+        await self.broadcast_chat(room_id, ChatMessage(
+            player_name="系统",
+            content=f"进入{stage.display_name}阶段",
+            msg_type="system"
+        ))
+
     async def _handle_showdown(self, room_id: str, table: PokerTable):
         """处理摊牌"""
         self._cancel_timer(room_id)
@@ -438,39 +517,77 @@ class GameService:
 
         await self.broadcast_game_state(room_id, winners=winners_data)
         table.end_hand()
+        self._update_room_summary(table)
 
     # ============ 计时器 ============
 
     def _cancel_timer(self, room_id: str):
         """取消计时器"""
-        if room_id in self.turn_timers:
-            self.turn_timers[room_id].cancel()
-            del self.turn_timers[room_id]
         self.turn_start_time.pop(room_id, None)
 
     async def _start_turn_timer(self, room_id: str):
         """启动回合计时器"""
-        self._cancel_timer(room_id)
         self.turn_start_time[room_id] = time.time()
-
-        async def timeout_handler():
-            await asyncio.sleep(settings.turn_timeout)
-            table = self.get_room(room_id)
-            if table and table.stage not in [GameStage.WAITING, GameStage.SHOWDOWN]:
-                current_player = table.get_current_player()
-                if current_player and current_player.can_act():
-                    await self.handle_player_action(
-                        room_id,
-                        current_player.id,
-                        {"action": "fold"}
-                    )
-                    await self.broadcast_chat(room_id, ChatMessage(
-                        player_name="系统",
-                        content=f"{current_player.name} 超时自动弃牌",
-                        msg_type="system"
-                    ))
-
-        self.turn_timers[room_id] = asyncio.create_task(timeout_handler())
+        if self._timer_task is None or self._timer_task.done():
+            self._timer_task = asyncio.create_task(self._timeout_ticker())
+
+    async def _timeout_ticker(self):
+        """每秒检查一次所有房间的回合是否超时，没有计时中的房间时退出
+
+        超时处理可能一路走到发完剩余公共牌，期间会等待，
+        因此每个超时房间单独起任务处理，不阻塞其他房间的计时。
+        """
+        while self.turn_start_time:
+            await asyncio.sleep(1)
+            deadline = time.time() - settings.turn_timeout
+            expired = [
+                room_id for room_id, start in self.turn_start_time.items()
+                if start <= deadline
+            ]
+            for room_id in expired:
+                del self.turn_start_time[room_id]
+                # 记下超时的玩家，任务真正执行前该玩家可能已经行动
+                table = self.get_room(room_id)
+                current_player = table.get_current_player() if table else None
+                if current_player is None:
+                    continue
+                task = asyncio.create_task(self._run_timeout(room_id, current_player.id))
+                self._timeout_tasks.add(task)
+                task.add_done_callback(self._timeout_tasks.discard)
+
+    async def _run_timeout(self, room_id: str, player_id: str):
+        """处理单个房间的超时，异常只记录日志"""
+        try:
+            await self._handle_timeout(room_id, player_id)
+        except Exception:
+            logger.exception("房间 %s 超时处理失败", room_id)
+
+    async def _handle_timeout(self, room_id: str, player_id: str):
+        """超时玩家仍在行动时自动弃牌
+
+        超时后、处理前若已开始新的回合计时，或轮到的已不是该玩家，
+        说明玩家已在超时的同时行动，不再弃牌。
+        """
+        if room_id in self.turn_start_time:
+            return
+        table = self.get_room(room_id)
+        if table and table.stage not in NON_ACTION_STAGES:
+            current_player = table.get_current_player()
+            if (
+                current_player and
+                current_player.id == player_id and
+                current_player.can_act()
+            ):
+                await self.handle_player_action(
+                    room_id,
+                    current_player.id,
+                    {"action": "fold"}
+                )
+                await self.broadcast_chat(room_id, ChatMessage(
+                    player_name="系统",
+                    content=f"{current_player.name} 超时自动弃牌",
+                    msg_type="system"
+                ))
 
     def get_remaining_time(self, room_id: str) -> int:
         """获取剩余时间"""
@@ -484,14 +601,10 @@ class GameService:
     async def broadcast_chat(self, room_id: str, message: ChatMessage):
         """广播聊天消息"""
         if room_id not in self.chat_history:
-            self.chat_history[room_id] = []
+            self.chat_history[room_id] = deque(maxlen=settings.max_chat_history)
         self.chat_history[room_id].append(message)
 
-        # 限制历史数量
-        if len(self.chat_history[room_id]) > settings.max_chat_history:
-            self.chat_history[room_id] = self.chat_history[room_id][-settings.max_chat_history:]
-
-        await self.connection_manager.broadcast_to_room(room_id, {
+        self.connection_manager.broadcast_to_room(room_id, {
             "type": "chat",
             "data": message.to_dict()
         })
@@ -499,7 +612,7 @@ class GameService:
     def _add_action(self, room_id: str, player_name: str, action: str, amount: int = 0):
         """添加操作记录"""
         if room_id not in self.action_history:
-            self.action_history[room_id] = []
+            self.action_history[room_id] = deque(maxlen=settings.max_action_history)
 
         self.action_history[room_id].append(GameAction(
             player_name=player_name,
@@ -507,9 +620,6 @@ class GameService:
             amount=amount
         ))
 
-        if len(self.action_history[room_id]) > settings.max_action_history:
-            self.action_history[room_id] = self.action_history[room_id][-settings.max_action_history:]
-
     # ============ 状态广播 ============
 
     def get_game_state_for_player(self, room_id: str, player_id: str) -> Optional[dict]:
@@ -519,25 +629,79 @@ class GameService:
             return None
 
         state = table.to_dict_for_player(player_id)
-        state["remaining_time"] = self.get_remaining_time(room_id)
-        state["action_history"] = [
-            a.to_dict() for a in (self.action_history.get(room_id, []))[-10:]
-        ]
+        state.update(self._get_shared_state(room_id))
         return state
 
+    def _get_shared_state(self, room_id: str) -> dict:
+        """所有玩家视角都相同的附加状态"""
+        history = self.action_history.get(room_id, ())
+        return {
+            "remaining_time": self.get_remaining_time(room_id),
+            "action_history": [
+                a.to_dict() for a in islice(history, max(0, len(history) - 10), None)
+            ],
+        }
+
+    async def send_game_state(self, room_id: str, player_id: str):
+        """发送游戏状态给指定玩家"""
+        table = self.get_room(room_id)
+        if table:
+            self._send_game_state(table, [player_id])
+
     async def broadcast_game_state(self, room_id: str, winners: list = None):
-        """广播游戏状态给房间所有玩家"""
+        """
+        广播游戏状态给房间所有玩家
+
+        同一轮事件循环内的多次广播合并为一次，状态是完整快照，只需发送最新的。
+        带赢家信息的广播立即发送，之后的 end_hand 会清掉本手牌的状态。
+        """
+        if winners:
+            self._cancel_broadcast(room_id)
+            self._flush_broadcast(room_id, winners)
+            return
+
+        if room_id not in self._pending_broadcasts:
+            loop = asyncio.get_running_loop()
+            self._pending_broadcasts[room_id] = loop.call_soon(self._flush_broadcast, room_id)
+
+    def _cancel_broadcast(self, room_id: str):
+        """取消等待中的状态广播"""
+        handle = self._pending_broadcasts.pop(room_id, None)
+        if handle:
+            handle.cancel()
+
+    def _flush_broadcast(self, room_id: str, winners: list = None):
+        """执行状态广播"""
+        self._pending_broadcasts.pop(room_id, None)
         table = self.get_room(room_id)
         if not table:
             return
 
-        for player in table.players:
-            state = self.get_game_state_for_player(room_id, player.id)
-            if state:
-                if winners:
-                    state["winners"] = winners
-                await self.connection_manager.send_to_player(
-                    room_id,
-                    player.id,
-                    {"type": "game_state", "data": state}
-                )
+        # 阶段和人数变化都会广播状态，此时同步房间摘要
+        self._update_room_summary(table)
+
+        self._send_game_state(table, table.player_ids, winners)
+
+    def _send_game_state(
+        self,
+        table: PokerTable,
+        player_ids: List[str],
+        winners: list = None
+    ):
+        """
+        发送游戏状态
+
+        公共状态只序列化一次，每个玩家只额外序列化自己的底牌和可用操作，
+        消息格式: {"type": "game_state", "public": {...}, "private": {...}}
+        """
+        public_state = table.to_public_dict()
+        public_state.update(self._get_shared_state(table.room_id))
+        if winners:
+            public_state["winners"] = winners
+        prefix = '{"type":"game_state","public":' + to_json(public_state) + ',"private":'
+
+        for player_id in player_ids:
+            message = prefix + to_json(table.to_private_dict(player_id)) + "}"
+            self.connection_manager.send_to_player(
+                table.room_id, player_id, message, snapshot=True
+            )
@@ -1,5 +1,6 @@
 """配置"""
-from dataclasses import dataclass
+import os
+from dataclasses import dataclass, field
 
 
 @dataclass
@@ -8,6 +9,13 @@ class Settings:
     # 服务器
     host: str = "0.0.0.0"
     port: int = 8080
+    # 事件循环: uvicorn[standard] 自带 uvloop，设置 USE_UVLOOP=0 时改用标准 asyncio
+    use_uvloop: bool = field(
+        default_factory=lambda: os.environ.get("USE_UVLOOP", "1") != "0"
+    )
+
+    # WebSocket
+    ws_per_message_deflate: bool = False  # 游戏消息很小，压缩的CPU开销大于节省的带宽
 
     # 游戏默认配置
     default_chips: int = 1000
@@ -17,6 +25,8 @@ class Settings:
 
     # 计时器
     turn_timeout: int = 30  # 每回合超时秒数
+    runout_delay_seconds: float = 1.0  # 全押后自动发公共牌的间隔
+    runout_fast_mode: bool = False  # 全押后不等待，直接发完公共牌并摊牌
 
     # 聊天
     max_chat_history: int = 100
@@ -7,6 +7,7 @@ from src.infrastructure.storage import MemoryRoomStorage
 # 单例实例
 _connection_manager = None
 _room_storage = None
+_game_service = None
 
 
 def get_connection_manager() -> ConnectionManager:
@@ -26,9 +27,12 @@ def get_room_storage() -> MemoryRoomStorage:
 
 
 def get_game_service():
-    """获取游戏服务"""
-    from src.application.services.game_service import GameService
-    return GameService(
-        room_storage=get_room_storage(),
-        connection_manager=get_connection_manager()
-    )
+    """获取游戏服务单例"""
+    global _game_service
+    if _game_service is None:
+        from src.application.services.game_service import GameService
+        _game_service = GameService(
+            room_storage=get_room_storage(),
+            connection_manager=get_connection_manager()
+        )
+    return _game_service
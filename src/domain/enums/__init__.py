@@ -33,12 +33,14 @@ class BettingMode(Enum):
     @property
     def display_name(self) -> str:
         """显示名称"""
-        names = {
-            BettingMode.LIMIT: "限注",
-            BettingMode.NO_LIMIT: "无限注",
-            BettingMode.POT_LIMIT: "彩池限注"
-        }
-        return names.get(self, self.value)
+        return _BETTING_MODE_NAMES.get(self, self.value)
+
+
+_BETTING_MODE_NAMES = {
+    BettingMode.LIMIT: "限注",
+    BettingMode.NO_LIMIT: "无限注",
+    BettingMode.POT_LIMIT: "彩池限注"
+}
 
 
 class GameStage(Enum):
@@ -53,15 +55,20 @@ class GameStage(Enum):
     @property
     def display_name(self) -> str:
         """显示名称"""
-        names = {
-            GameStage.WAITING: "等待中",
-            GameStage.PREFLOP: "翻牌前",
-            GameStage.FLOP: "翻牌",
-            GameStage.TURN: "转牌",
-            GameStage.RIVER: "河牌",
-            GameStage.SHOWDOWN: "摊牌"
-        }
-        return names.get(self, self.value)
+        return _GAME_STAGE_NAMES.get(self, self.value)
+
+
+_GAME_STAGE_NAMES = {
+    GameStage.WAITING: "等待中",
+    GameStage.PREFLOP: "翻牌前",
+    GameStage.FLOP: "翻牌",
+    GameStage.TURN: "转牌",
+    GameStage.RIVER: "河牌",
+    GameStage.SHOWDOWN: "摊牌"
+}
+
+# 无人行动的阶段
+NON_ACTION_STAGES = frozenset({GameStage.WAITING, GameStage.SHOWDOWN})
 
 
 class PlayerStatus(Enum):
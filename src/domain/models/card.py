@@ -1,87 +1,129 @@
 """扑克牌模型"""
-from dataclasses import dataclass
-from typing import Tuple
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
 from src.domain.enums import Suit
 
 
-class Rank:
-    """牌点数"""
-
-    # 点数定义: (数值, 显示字符)
-    RANK_DATA = {
-        2: (2, "2"),
-        3: (3, "3"),
-        4: (4, "4"),
-        5: (5, "5"),
-        6: (6, "6"),
-        7: (7, "7"),
-        8: (8, "8"),
-        9: (9, "9"),
-        10: (10, "10"),
-        11: (11, "J"),
-        12: (12, "Q"),
-        13: (13, "K"),
-        14: (14, "A"),
+# 花色 -> 牌的颜色
+_SUIT_COLOR: Dict[Suit, str] = {
+    Suit.HEARTS: "red",
+    Suit.DIAMONDS: "red",
+    Suit.CLUBS: "black",
+    Suit.SPADES: "black",
+}
+
+# Cactus-Kev 编码: 点数 2..A 对应的素数，以及花色位
+RANK_PRIMES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+_SUIT_BITS: Dict[Suit, int] = {
+    Suit.SPADES: 0x1,
+    Suit.HEARTS: 0x2,
+    Suit.DIAMONDS: 0x4,
+    Suit.CLUBS: 0x8,
+}
+
+
+class Rank(int):
+    """牌点数
+
+    int 的子类，比较、哈希和算术直接使用 int 的实现；相同点数共享同一个对象。
+    """
+
+    __slots__ = ()
+
+    # 点数定义: 以点数为下标的 (数值, 显示字符)，0 和 1 不是合法点数
+    _RANK_TABLE: Tuple[Optional[Tuple[int, str]], ...] = (
+        None, None,
+        (2, "2"), (3, "3"), (4, "4"), (5, "5"), (6, "6"), (7, "7"),
+        (8, "8"), (9, "9"), (10, "10"), (11, "J"), (12, "Q"), (13, "K"),
+        (14, "A"),
+    )
+
+    # 点数 -> (数值, 显示字符)，由 _RANK_TABLE 生成，保留原有的公开接口
+    RANK_DATA: Dict[int, Tuple[int, str]] = {
+        value: entry for value, entry in enumerate(_RANK_TABLE) if entry
     }
 
-    def __init__(self, value: int):
-        if value not in self.RANK_DATA:
-            raise ValueError(f"Invalid rank value: {value}")
-        self._value = value
-        self._num_value, self._display = self.RANK_DATA[value]
+    # 已创建的实例，相同点数共享同一个对象
+    _instances: Dict[int, 'Rank'] = {}
+
+    def __new__(cls, value: int):
+        instance = cls._instances.get(value)
+        if instance is None:
+            if isinstance(value, int) and 2 <= value <= 14:
+                entry = cls._RANK_TABLE[value]
+            else:
+                # 非 int 的输入（如 2.0）按原字典语义查找，未知值统一抛 ValueError
+                entry = cls.RANK_DATA.get(value)
+            if entry is None:
+                raise ValueError(f"Invalid rank value: {value}")
+            instance = super().__new__(cls, entry[0])
+            cls._instances[value] = instance
+        return instance
 
     @property
     def value(self) -> int:
-        return self._value
+        return int(self)
 
     @property
     def num_value(self) -> int:
         """数值（用于比较）"""
-        return self._num_value
+        return int(self)
 
     @property
     def display(self) -> str:
         """显示字符"""
-        return self._display
-
-    def __eq__(self, other):
-        if isinstance(other, Rank):
-            return self._value == other._value
-        return False
+        return self._RANK_TABLE[self][1]
 
-    def __lt__(self, other):
-        if isinstance(other, Rank):
-            return self._value < other._value
-        return NotImplemented
+    def __repr__(self):
+        return f"Rank({self.display})"
 
-    def __hash__(self):
-        return hash(self._value)
 
-    def __repr__(self):
-        return f"Rank({self._display})"
+# 点数 -> 显示字符
+_RANK_DISPLAY: Dict[int, str] = {
+    value: display for value, (_, display) in Rank.RANK_DATA.items()
+}
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Card:
     """扑克牌"""
     suit: Suit
-    rank: Rank
+    rank: Rank  # 点数 2-14（A 为 14），传入 int 时转换为 Rank
+    # 前端显示用的字典，牌不可变，构造时生成一次
+    _dict: dict = field(init=False, repr=False, compare=False)
+    # Cactus-Kev 整数编码: 点数位(16-28) | 花色位(12-15) | 点数序号(8-11) | 素数(0-7)
+    cactus: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # Rank 构造时校验点数，非法值抛 ValueError
+        object.__setattr__(self, "rank", Rank(self.rank))
+        object.__setattr__(self, "_dict", {
+            "suit": self.suit.value,
+            "rank": self.rank_display,
+            "color": self.color
+        })
+        index = self.rank - 2
+        object.__setattr__(
+            self, "cactus",
+            (1 << (16 + index)) | (_SUIT_BITS[self.suit] << 12) | (index << 8) | RANK_PRIMES[index]
+        )
+
+    @property
+    def rank_display(self) -> str:
+        """点数显示字符"""
+        return _RANK_DISPLAY[self.rank]
 
     @property
     def color(self) -> str:
         """牌的颜色"""
-        return "red" if self.suit in [Suit.HEARTS, Suit.DIAMONDS] else "black"
+        return _SUIT_COLOR[self.suit]
 
     def to_dict(self) -> dict:
-        """转换为字典（用于前端显示）"""
-        return {
-            "suit": self.suit.value,
-            "rank": self.rank.display,
-            "color": self.color
-        }
+        """转换为字典（用于前端显示，返回共享对象，请勿修改）"""
+        return self._dict
 
     def __str__(self):
-        return f"{self.rank.display}{self.suit.value}"
+        return f"{self.rank_display}{self.suit.value}"
 
     def __repr__(self):
-        return f"Card({self.rank.display}{self.suit.value})"
+        return f"Card({self.rank_display}{self.suit.value})"
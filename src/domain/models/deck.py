@@ -1,38 +1,57 @@
 """牌组模型"""
 import random
+from array import array
 from typing import List, Optional
 from src.domain.enums import Suit
-from src.domain.models.card import Card, Rank
+from src.domain.models.card import Card
+
+
+# 完整的52张牌，Card 不可变，所有牌组共享
+_FULL_DECK = tuple(
+    Card(suit=suit, rank=value)
+    for suit in Suit
+    for value in range(2, 15)  # 2-A
+)
+
+# 未洗牌时的牌序（_FULL_DECK 下标）
+_INITIAL_ORDER = array('B', range(len(_FULL_DECK)))
 
 
 class Deck:
-    """牌组"""
+    """牌组
+
+    牌序保存为 _FULL_DECK 的下标数组，发牌只移动位置，重置时原地洗牌。
+    """
 
     def __init__(self):
-        self._cards: List[Card] = []
+        self._order = array('B', _INITIAL_ORDER)
+        self._pos = 0  # 下一张要发的牌在 _order 中的位置
         self._burned: List[Card] = []
         self.reset()
 
     def reset(self):
         """重置牌组"""
-        self._cards = []
+        self._order[:] = _INITIAL_ORDER
+        self._pos = 0
         self._burned = []
-        for suit in Suit:
-            for value in range(2, 15):  # 2-A
-                self._cards.append(Card(suit=suit, rank=Rank(value)))
         self.shuffle()
 
     def shuffle(self):
-        """洗牌"""
-        random.shuffle(self._cards)
+        """洗牌（只打乱未发出的牌）"""
+        if self._pos == 0:
+            random.shuffle(self._order)
+        else:
+            rest = self._order[self._pos:]
+            random.shuffle(rest)
+            self._order[self._pos:] = rest
 
     def draw(self, count: int = 1) -> List[Card]:
         """发牌"""
-        if count > len(self._cards):
-            raise ValueError(f"Not enough cards in deck. Requested {count}, available {len(self._cards)}")
-        drawn = self._cards[:count]
-        self._cards = self._cards[count:]
-        return drawn
+        if count > self.remaining:
+            raise ValueError(f"Not enough cards in deck. Requested {count}, available {self.remaining}")
+        start = self._pos
+        self._pos += count
+        return [_FULL_DECK[i] for i in self._order[start:self._pos]]
 
     def draw_one(self) -> Optional[Card]:
         """发一张牌"""
@@ -41,8 +60,9 @@ class Deck:
 
     def burn(self) -> Optional[Card]:
         """烧牌"""
-        if self._cards:
-            card = self._cards.pop(0)
+        if self._pos < len(self._order):
+            card = _FULL_DECK[self._order[self._pos]]
+            self._pos += 1
             self._burned.append(card)
             return card
         return None
@@ -50,7 +70,7 @@ class Deck:
     @property
     def remaining(self) -> int:
         """剩余牌数"""
-        return len(self._cards)
+        return len(self._order) - self._pos
 
     @property
     def burned_cards(self) -> List[Card]:
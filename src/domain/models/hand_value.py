@@ -1,49 +1,55 @@
 """牌值比较模型"""
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import List, Tuple
 from src.domain.enums import HandRank
 from src.domain.models.card import Card
 
 
-@dataclass
+_HAND_RANK_NAMES = {
+    HandRank.HIGH_CARD: "高牌",
+    HandRank.PAIR: "一对",
+    HandRank.TWO_PAIR: "两对",
+    HandRank.THREE_OF_KIND: "三条",
+    HandRank.STRAIGHT: "顺子",
+    HandRank.FLUSH: "同花",
+    HandRank.FULL_HOUSE: "葫芦",
+    HandRank.FOUR_OF_KIND: "四条",
+    HandRank.STRAIGHT_FLUSH: "同花顺",
+    HandRank.ROYAL_FLUSH: "皇家同花顺",
+}
+
+
+@dataclass(slots=True)
 class HandValue:
     """牌型值，用于比较"""
     rank: HandRank
     kickers: Tuple[int, ...]  # 比较用的踢牌数值
     cards: List[Card]  # 组成牌型的牌
+    # 比较键: 牌型等级和最多5个踢牌各占4位，按高位到低位打包成一个整数
+    _key: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        key = self.rank.value
+        for i in range(5):
+            key = (key << 4) | (self.kickers[i] if i < len(self.kickers) else 0)
+        self._key = key
 
     def __lt__(self, other: 'HandValue') -> bool:
-        if self.rank.value != other.rank.value:
-            return self.rank.value < other.rank.value
-        return self.kickers < other.kickers
+        return self._key < other._key
 
     def __gt__(self, other: 'HandValue') -> bool:
-        if self.rank.value != other.rank.value:
-            return self.rank.value > other.rank.value
-        return self.kickers > other.kickers
+        return self._key > other._key
 
     def __eq__(self, other: 'HandValue') -> bool:
-        return self.rank == other.rank and self.kickers == other.kickers
+        return self._key == other._key
 
     def __le__(self, other: 'HandValue') -> bool:
-        return self == other or self < other
+        return self._key <= other._key
 
     def __ge__(self, other: 'HandValue') -> bool:
-        return self == other or self > other
+        return self._key >= other._key
 
     @property
     def display_name(self) -> str:
         """牌型中文名"""
-        names = {
-            HandRank.HIGH_CARD: "高牌",
-            HandRank.PAIR: "一对",
-            HandRank.TWO_PAIR: "两对",
-            HandRank.THREE_OF_KIND: "三条",
-            HandRank.STRAIGHT: "顺子",
-            HandRank.FLUSH: "同花",
-            HandRank.FULL_HOUSE: "葫芦",
-            HandRank.FOUR_OF_KIND: "四条",
-            HandRank.STRAIGHT_FLUSH: "同花顺",
-            HandRank.ROYAL_FLUSH: "皇家同花顺",
-        }
-        return names.get(self.rank, str(self.rank))
+        return _HAND_RANK_NAMES.get(self.rank, str(self.rank))
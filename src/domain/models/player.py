@@ -5,7 +5,7 @@ from src.domain.enums import PlayerStatus
 from src.domain.models.card import Card
 
 
-@dataclass
+@dataclass(slots=True)
 class Player:
     """玩家"""
     id: str
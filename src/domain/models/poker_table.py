@@ -1,9 +1,9 @@
 """牌桌/游戏状态模型"""
 from dataclasses import dataclass, field
 from typing import List, Optional, Tuple, Dict, Any
-import uuid
+import secrets
 
-from src.domain.enums import BettingMode, GameStage
+from src.domain.enums import BettingMode, GameStage, NON_ACTION_STAGES
 from src.domain.models.card import Card
 from src.domain.models.deck import Deck
 from src.domain.models.player import Player
@@ -13,12 +13,21 @@ from src.domain.rules.betting_rules import BettingRule, BettingRuleFactory
 from src.domain.services.hand_evaluator import HandEvaluator
 
 
-@dataclass
+# 下注轮结束后的下一阶段，以及进入该阶段前要发的公共牌数
+_NEXT_STAGE: Dict[GameStage, Tuple[GameStage, int]] = {
+    GameStage.PREFLOP: (GameStage.FLOP, 3),
+    GameStage.FLOP: (GameStage.TURN, 1),
+    GameStage.TURN: (GameStage.RIVER, 1),
+    GameStage.RIVER: (GameStage.SHOWDOWN, 0),
+}
+
+
+@dataclass(slots=True)
 class PokerTable:
     """德州扑克牌桌"""
 
     # 房间信息
-    room_id: str = field(default_factory=lambda: str(uuid.uuid4())[:8].upper())
+    room_id: str = field(default_factory=lambda: secrets.token_hex(4).upper())
     room_name: str = "德州扑克"
     room_owner: Optional[str] = None  # 房主玩家ID
 
@@ -35,6 +44,8 @@ class PokerTable:
     # 游戏状态
     stage: GameStage = GameStage.WAITING
     players: List[Player] = field(default_factory=list)
+    player_ids: List[str] = field(default_factory=list)  # 与 players 顺序一致
+    _player_index: Dict[str, int] = field(default_factory=dict, repr=False)  # 玩家ID -> 座位下标
     deck: Deck = field(default_factory=Deck)
     community_cards: List[Card] = field(default_factory=list)
     pot: Pot = field(default_factory=Pot)
@@ -49,6 +60,10 @@ class PokerTable:
     raise_count: int = 0  # 当前轮加注次数
     last_raiser_index: int = -1  # 最后加注者位置
 
+    # 盲注位置缓存，-1 表示需要重新计算（人数或庄家变化时失效）
+    _sb_pos: int = field(default=-1, repr=False)
+    _bb_pos: int = field(default=-1, repr=False)
+
     def __post_init__(self):
         if self.betting_rule is None:
             self.betting_rule = BettingRuleFactory.create(self.betting_mode)
@@ -61,9 +76,8 @@ class PokerTable:
             return False
 
         # 检查是否已存在
-        for p in self.players:
-            if p.id == player_id:
-                return True
+        if player_id in self._player_index:
+            return True
 
         player = Player(
             id=player_id,
@@ -72,6 +86,9 @@ class PokerTable:
             position=len(self.players)
         )
         self.players.append(player)
+        self.player_ids.append(player_id)
+        self._player_index[player_id] = player.position
+        self._invalidate_blind_positions()
 
         # 第一个玩家成为房主
         if self.room_owner is None:
@@ -81,23 +98,26 @@ class PokerTable:
 
     def remove_player(self, player_id: str):
         """移除玩家"""
-        for i, p in enumerate(self.players):
-            if p.id == player_id:
-                self.players.pop(i)
-                # 更新后续玩家位置
-                for j in range(i, len(self.players)):
-                    self.players[j].position = j
-                # 如果是房主离开，转移给下一个玩家
-                if self.room_owner == player_id and self.players:
-                    self.room_owner = self.players[0].id
-                break
+        i = self._player_index.pop(player_id, None)
+        if i is None:
+            return
+        players = self.players
+        players.pop(i)
+        self.player_ids.pop(i)
+        # 一次遍历更新后续玩家的位置和索引
+        for j in range(i, len(players)):
+            p = players[j]
+            p.position = j
+            self._player_index[p.id] = j
+        self._invalidate_blind_positions()
+        # 如果是房主离开，转移给下一个玩家
+        if self.room_owner == player_id and self.players:
+            self.room_owner = self.players[0].id
 
     def get_player(self, player_id: str) -> Optional[Player]:
         """获取玩家"""
-        for p in self.players:
-            if p.id == player_id:
-                return p
-        return None
+        i = self._player_index.get(player_id)
+        return self.players[i] if i is not None else None
 
     def get_current_player(self) -> Optional[Player]:
         """获取当前行动玩家"""
@@ -166,6 +186,8 @@ class PokerTable:
             # 多人：庄家后一位小盲，再后一位大盲
             sb_pos = (self.dealer_position + 1) % num_players
             bb_pos = (self.dealer_position + 2) % num_players
+        self._sb_pos = sb_pos
+        self._bb_pos = bb_pos
 
         # 小盲
         sb_player = self.players[sb_pos]
@@ -198,20 +220,12 @@ class PokerTable:
             p.reset_for_new_round()
 
         # 发公共牌
-        if self.stage == GameStage.PREFLOP:
-            self.stage = GameStage.FLOP
-            self.deck.burn()
-            self.community_cards.extend(self.deck.draw(3))
-        elif self.stage == GameStage.FLOP:
-            self.stage = GameStage.TURN
-            self.deck.burn()
-            self.community_cards.extend(self.deck.draw(1))
-        elif self.stage == GameStage.TURN:
-            self.stage = GameStage.RIVER
-            self.deck.burn()
-            self.community_cards.extend(self.deck.draw(1))
-        elif self.stage == GameStage.RIVER:
-            self.stage = GameStage.SHOWDOWN
+        next_stage = _NEXT_STAGE.get(self.stage)
+        if next_stage is not None:
+            self.stage, draw_count = next_stage
+            if draw_count:
+                self.deck.burn()
+                self.community_cards.extend(self.deck.draw(draw_count))
 
         # 设置首个行动玩家（庄家后第一个活跃玩家）
         self._set_first_to_act()
@@ -281,22 +295,31 @@ class PokerTable:
                 return next_pos
         return -1
 
-    def is_betting_round_complete(self) -> bool:
-        """检查下注轮是否完成"""
-        active_players = [p for p in self.players if not p.folded and not p.all_in]
-
-        # 如果只剩0-1个可行动玩家，下注轮完成
-        if len(active_players) <= 1:
-            return True
+    def scan_betting_state(self) -> Tuple[int, int, bool]:
+        """
+        遍历一次玩家，统计下注轮状态
 
-        # 检查所有可行动玩家是否都已行动且下注额相同
-        for p in active_players:
-            if not p.has_acted:
-                return False
-            if p.current_bet != self.current_bet:
-                return False
+        返回: (未弃牌人数, 可行动人数, 下注轮是否完成)
+        下注轮完成: 可行动玩家不超过1人，或都已行动且下注额都等于当前下注
+        """
+        active_count = 0
+        can_act_count = 0
+        all_settled = True
+        current_bet = self.current_bet
+        for p in self.players:
+            if p.folded:
+                continue
+            active_count += 1
+            if p.all_in:
+                continue
+            can_act_count += 1
+            if not p.has_acted or p.current_bet != current_bet:
+                all_settled = False
+        return active_count, can_act_count, can_act_count <= 1 or all_settled
 
-        return True
+    def is_betting_round_complete(self) -> bool:
+        """检查下注轮是否完成"""
+        return self.scan_betting_state()[2]
 
     # ============ 结算 ============
 
@@ -316,24 +339,27 @@ class PokerTable:
             return [(winner, amount, None)]
 
         # 计算每个玩家的牌力
-        player_hands: Dict[str, HandValue] = {}
-        for p in active_players:
-            all_cards = p.hand + self.community_cards
-            if len(all_cards) >= 5:
-                player_hands[p.id] = HandEvaluator.evaluate(all_cards)
+        # 公共牌部分由 evaluate_hands 统一计算一次
+        showdown_players = [
+            p for p in active_players
+            if len(p.hand) + len(self.community_cards) >= 5
+        ]
+        hand_values = HandEvaluator.evaluate_hands(
+            [p.hand for p in showdown_players], self.community_cards
+        )
+        player_hands: Dict[str, HandValue] = {
+            p.id: hv for p, hv in zip(showdown_players, hand_values)
+        }
 
         # 简化版底池分配（暂不处理边池）
-        # 找出最强牌
-        best_value = None
-        for pid, hv in player_hands.items():
-            if best_value is None or hv > best_value:
-                best_value = hv
+        # 找出最强牌（HandValue 按打包的整数键比较）
+        best_value = max(hand_values)
 
         # 找出所有拥有最强牌的玩家
-        winners = []
-        for p in active_players:
-            if p.id in player_hands and player_hands[p.id] == best_value:
-                winners.append(p)
+        winners = [
+            p for p, hv in zip(showdown_players, hand_values)
+            if hv == best_value
+        ]
 
         # 平分底池
         pot_per_winner = self.pot.total // len(winners)
@@ -353,52 +379,60 @@ class PokerTable:
         self.stage = GameStage.WAITING
         # 移动庄家位置
         self.dealer_position = (self.dealer_position + 1) % len(self.players)
+        self._invalidate_blind_positions()
         # 移除筹码为0的玩家（可选）
         # self.players = [p for p in self.players if p.chips > 0]
 
+    def _invalidate_blind_positions(self):
+        """盲注位置缓存失效"""
+        self._sb_pos = -1
+        self._bb_pos = -1
+
     def get_sb_position(self) -> int:
         """获取小盲位置"""
-        if len(self.players) < 2:
-            return -1
-        if len(self.players) == 2:
-            return self.dealer_position
-        return (self.dealer_position + 1) % len(self.players)
+        if self._sb_pos < 0:
+            if len(self.players) < 2:
+                return -1
+            if len(self.players) == 2:
+                self._sb_pos = self.dealer_position
+            else:
+                self._sb_pos = (self.dealer_position + 1) % len(self.players)
+        return self._sb_pos
 
     def get_bb_position(self) -> int:
         """获取大盲位置"""
-        if len(self.players) < 2:
-            return -1
-        if len(self.players) == 2:
-            return (self.dealer_position + 1) % len(self.players)
-        return (self.dealer_position + 2) % len(self.players)
+        if self._bb_pos < 0:
+            if len(self.players) < 2:
+                return -1
+            if len(self.players) == 2:
+                self._bb_pos = (self.dealer_position + 1) % len(self.players)
+            else:
+                self._bb_pos = (self.dealer_position + 2) % len(self.players)
+        return self._bb_pos
 
     # ============ 序列化 ============
 
-    def to_dict_for_player(self, player_id: str) -> Dict[str, Any]:
-        """生成玩家视角的游戏状态"""
-        player = self.get_player(player_id)
+    def to_public_dict(self) -> Dict[str, Any]:
+        """生成所有玩家相同的公共状态（不含未公开的底牌）"""
         is_showdown = self.stage == GameStage.SHOWDOWN
 
+        # 循环内不变的位置信息
+        dealer_pos = self.dealer_position
+        current_idx = self.current_player_index
+        sb_pos = self.get_sb_position()
+        bb_pos = self.get_bb_position()
+
         # 构建玩家列表
         players_data = []
         for p in self.players:
-            is_self = p.id == player_id
-            show_hand = is_showdown and not p.folded
-            p_dict = p.to_dict(is_self=is_self, show_hand=show_hand)
-            p_dict["is_dealer"] = p.position == self.dealer_position
-            p_dict["is_current"] = p.position == self.current_player_index
-            p_dict["is_sb"] = p.position == self.get_sb_position()
-            p_dict["is_bb"] = p.position == self.get_bb_position()
+            position = p.position
+            p_dict = p.to_dict(show_hand=is_showdown and not p.folded)
+            p_dict["is_dealer"] = position == dealer_pos
+            p_dict["is_current"] = position == current_idx
+            p_dict["is_sb"] = position == sb_pos
+            p_dict["is_bb"] = position == bb_pos
             players_data.append(p_dict)
 
-        # 计算当前玩家的操作信息
-        to_call = 0
-        min_raise = self.get_min_raise()
-        max_raise = 0
-        if player:
-            to_call = self.can_call(player)
-            max_raise = self.get_max_raise(player)
-
         return {
             "room_id": self.room_id,
             "room_name": self.room_name,
@@ -407,24 +441,56 @@ class PokerTable:
             "community_cards": [c.to_dict() for c in self.community_cards],
             "main_pot": self.pot.total,
             "current_bet": self.current_bet,
-            "min_raise": min_raise,
-            "max_raise": max_raise,
+            "min_raise": self.get_min_raise(),
             "has_bet_this_round": self.current_bet > 0,
-            "to_call": to_call,
             "raise_count": self.raise_count,
             "max_raises": self.betting_rule.max_raises_per_round,
             "can_raise": self.can_raise(),
             "dealer_position": self.dealer_position,
             "current_player_index": self.current_player_index,
             "players": players_data,
+            "can_start": len(self.players) >= 2 and self.stage == GameStage.WAITING,
+            "small_blind": self.small_blind,
+            "big_blind": self.big_blind,
+            "ante": self.ante,
+        }
+
+    def to_private_dict(self, player_id: str) -> Dict[str, Any]:
+        """生成玩家个人的状态（自己的底牌和可用操作）"""
+        player = self.get_player(player_id)
+
+        hand = []
+        to_call = 0
+        max_raise = 0
+        if player:
+            hand = [c.to_dict() for c in player.hand]
+            to_call = self.can_call(player)
+            max_raise = self.get_max_raise(player)
+
+        return {
+            "player_id": player_id,
+            "hand": hand,
+            "to_call": to_call,
+            "max_raise": max_raise,
             "is_my_turn": (
                 player is not None and
                 self.current_player_index == player.position and
-                self.stage not in [GameStage.WAITING, GameStage.SHOWDOWN]
+                self.stage not in NON_ACTION_STAGES
             ),
             "is_room_owner": self.room_owner == player_id,
-            "can_start": len(self.players) >= 2 and self.stage == GameStage.WAITING,
-            "small_blind": self.small_blind,
-            "big_blind": self.big_blind,
-            "ante": self.ante,
         }
+
+    def to_dict_for_player(self, player_id: str) -> Dict[str, Any]:
+        """生成玩家视角的完整游戏状态（公共状态合并个人状态）"""
+        state = self.to_public_dict()
+        private = self.to_private_dict(player_id)
+        hand = private.pop("hand")
+        del private["player_id"]
+
+        for p_dict in state["players"]:
+            if p_dict["id"] == player_id:
+                p_dict["is_self"] = True
+                p_dict["hand"] = hand
+
+        state.update(private)
+        return state
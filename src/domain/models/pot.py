@@ -3,29 +3,42 @@ from dataclasses import dataclass, field
 from typing import List, Set
 
 
-@dataclass
+@dataclass(slots=True)
 class SidePot:
     """边池"""
     amount: int
     eligible_player_ids: Set[str] = field(default_factory=set)
 
 
-@dataclass
+@dataclass(slots=True)
 class Pot:
     """底池管理"""
     main_pot: int = 0
     side_pots: List[SidePot] = field(default_factory=list)
+    # 边池金额合计，通过 add_side_pot / reset 维护
+    _side_total: int = field(default=0, repr=False)
+
+    def __post_init__(self):
+        self._side_total = sum(sp.amount for sp in self.side_pots)
 
     def add(self, amount: int):
         """增加主池"""
         self.main_pot += amount
 
+    def add_side_pot(self, amount: int, eligible_player_ids: Set[str]) -> SidePot:
+        """增加边池"""
+        side_pot = SidePot(amount=amount, eligible_player_ids=eligible_player_ids)
+        self.side_pots.append(side_pot)
+        self._side_total += amount
+        return side_pot
+
     @property
     def total(self) -> int:
         """总底池"""
-        return self.main_pot + sum(sp.amount for sp in self.side_pots)
+        return self.main_pot + self._side_total
 
     def reset(self):
         """重置"""
         self.main_pot = 0
         self.side_pots = []
+        self._side_total = 0
@@ -15,19 +15,15 @@ if TYPE_CHECKING:
 
 
 class BettingRule(ABC):
-    """下注规则基类"""
+    """下注规则基类
 
-    @property
-    @abstractmethod
-    def mode(self) -> BettingMode:
-        """下注模式"""
-        pass
+    子类以类属性声明 mode 和 max_raises_per_round，规则对象不可变。
+    """
 
-    @property
-    @abstractmethod
-    def max_raises_per_round(self) -> int:
-        """每轮最大加注次数（0表示无限制）"""
-        pass
+    # 下注模式
+    mode: BettingMode
+    # 每轮最大加注次数（0表示无限制）
+    max_raises_per_round: int = 0
 
     @abstractmethod
     def get_min_bet(self, big_blind: int, stage: GameStage) -> int:
@@ -69,9 +65,8 @@ class BettingRule(ABC):
 
     def can_raise(self, raise_count: int) -> bool:
         """是否还可以加注"""
-        if self.max_raises_per_round == 0:
-            return True
-        return raise_count < self.max_raises_per_round
+        max_raises = self.max_raises_per_round
+        return max_raises == 0 or raise_count < max_raises
 
 
 class NoLimitRule(BettingRule):
@@ -84,13 +79,8 @@ class NoLimitRule(BettingRule):
     - 全押：投入剩余所有筹码
     """
 
-    @property
-    def mode(self) -> BettingMode:
-        return BettingMode.NO_LIMIT
-
-    @property
-    def max_raises_per_round(self) -> int:
-        return 0  # 无限制
+    mode = BettingMode.NO_LIMIT
+    max_raises_per_round = 0  # 无限制
 
     def get_min_bet(self, big_blind: int, stage: GameStage) -> int:
         """最小下注额 = 大盲注"""
@@ -131,17 +121,15 @@ class LimitRule(BettingRule):
     # 限注模式每轮最大加注次数（含首次下注）
     MAX_RAISES = 4
 
-    @property
-    def mode(self) -> BettingMode:
-        return BettingMode.LIMIT
+    # 使用小注的阶段
+    _SMALL_BET_STAGES = frozenset({GameStage.PREFLOP, GameStage.FLOP})
 
-    @property
-    def max_raises_per_round(self) -> int:
-        return self.MAX_RAISES
+    mode = BettingMode.LIMIT
+    max_raises_per_round = MAX_RAISES
 
     def _get_bet_increment(self, big_blind: int, stage: GameStage) -> int:
         """获取固定的下注增量"""
-        if stage in [GameStage.PREFLOP, GameStage.FLOP]:
+        if stage in self._SMALL_BET_STAGES:
             return big_blind  # 小注
         else:
             return big_blind * 2  # 大注
@@ -190,13 +178,8 @@ class PotLimitRule(BettingRule):
     （即：如果你要加注，先计算跟注后的底池，然后最多可以加这么多）
     """
 
-    @property
-    def mode(self) -> BettingMode:
-        return BettingMode.POT_LIMIT
-
-    @property
-    def max_raises_per_round(self) -> int:
-        return 0  # 无限制
+    mode = BettingMode.POT_LIMIT
+    max_raises_per_round = 0  # 无限制
 
     def get_min_bet(self, big_blind: int, stage: GameStage) -> int:
         """最小下注额 = 大盲注"""
@@ -245,6 +228,8 @@ class BettingRuleFactory:
         BettingMode.POT_LIMIT: PotLimitRule,
     }
 
+    _modes = {mode.value: mode for mode in BettingMode}
+
     @classmethod
     def create(cls, mode: BettingMode) -> BettingRule:
         """创建下注规则实例"""
@@ -256,12 +241,7 @@ class BettingRuleFactory:
     @classmethod
     def create_from_string(cls, mode_str: str) -> BettingRule:
         """根据字符串创建规则"""
-        mode_map = {
-            "no_limit": BettingMode.NO_LIMIT,
-            "limit": BettingMode.LIMIT,
-            "pot_limit": BettingMode.POT_LIMIT,
-        }
-        mode = mode_map.get(mode_str.lower())
+        mode = cls._modes.get(mode_str.lower())
         if not mode:
             raise ValueError(f"Unknown betting mode: {mode_str}")
         return cls.create(mode)
@@ -0,0 +1,99 @@
+"""Cactus-Kev 5张牌查找表
+
+每种5张牌组合按牌力归入 7462 个等价类，1 为最大（皇家同花顺），7462 为最小（7-5-4-3-2 高牌）。
+同花按点数位掩码查 FLUSH_LOOKUP，其余按点数素数之积查 UNSUITED_LOOKUP。
+表在模块导入时生成。
+"""
+from itertools import combinations
+from typing import Dict, List, Tuple
+
+from src.domain.models.card import RANK_PRIMES
+
+
+# 顺子的点数位掩码，从 A-K-Q-J-10 到 5-4-3-2-A
+_STRAIGHTS: Tuple[int, ...] = tuple(0x1F << i for i in range(8, -1, -1)) + (0x100F,)
+
+# 各牌型最后（最小）的等价类
+MAX_STRAIGHT_FLUSH = 10
+MAX_FOUR_OF_KIND = 166
+MAX_FULL_HOUSE = 322
+MAX_FLUSH = 1599
+MAX_STRAIGHT = 1609
+MAX_THREE_OF_KIND = 2467
+MAX_TWO_PAIR = 3325
+MAX_PAIR = 6185
+MAX_HIGH_CARD = 7462
+
+FLUSH_LOOKUP: Dict[int, int] = {}
+UNSUITED_LOOKUP: Dict[int, int] = {}
+
+
+def _prime_product(indexes) -> int:
+    """点数序号对应素数之积"""
+    product = 1
+    for i in indexes:
+        product *= RANK_PRIMES[i]
+    return product
+
+
+def _build_tables():
+    """生成查找表"""
+    # 5张不同点数且不成顺子的组合，按牌力从大到小
+    distinct: List[Tuple[int, ...]] = [
+        combo for combo in combinations(range(12, -1, -1), 5)
+        if sum(1 << i for i in combo) not in _STRAIGHTS
+    ]
+    ranks_desc = range(12, -1, -1)
+
+    # 同花顺 / 顺子
+    for i, bits in enumerate(_STRAIGHTS):
+        indexes = [r for r in range(13) if bits >> r & 1]
+        FLUSH_LOOKUP[bits] = 1 + i
+        UNSUITED_LOOKUP[_prime_product(indexes)] = MAX_FLUSH + 1 + i
+
+    # 同花 / 高牌
+    for i, combo in enumerate(distinct):
+        FLUSH_LOOKUP[sum(1 << r for r in combo)] = MAX_FULL_HOUSE + 1 + i
+        UNSUITED_LOOKUP[_prime_product(combo)] = MAX_PAIR + 1 + i
+
+    # 四条
+    rank = MAX_STRAIGHT_FLUSH + 1
+    for quad in ranks_desc:
+        for kicker in ranks_desc:
+            if kicker != quad:
+                UNSUITED_LOOKUP[RANK_PRIMES[quad] ** 4 * RANK_PRIMES[kicker]] = rank
+                rank += 1
+
+    # 葫芦
+    for trips in ranks_desc:
+        for pair in ranks_desc:
+            if pair != trips:
+                UNSUITED_LOOKUP[RANK_PRIMES[trips] ** 3 * RANK_PRIMES[pair] ** 2] = rank
+                rank += 1
+
+    # 三条
+    rank = MAX_STRAIGHT + 1
+    for trips in ranks_desc:
+        others = [r for r in ranks_desc if r != trips]
+        for kickers in combinations(others, 2):
+            UNSUITED_LOOKUP[RANK_PRIMES[trips] ** 3 * _prime_product(kickers)] = rank
+            rank += 1
+
+    # 两对
+    for high, low in combinations(ranks_desc, 2):
+        for kicker in ranks_desc:
+            if kicker != high and kicker != low:
+                UNSUITED_LOOKUP[
+                    RANK_PRIMES[high] ** 2 * RANK_PRIMES[low] ** 2 * RANK_PRIMES[kicker]
+                ] = rank
+                rank += 1
+
+    # 一对
+    for pair in ranks_desc:
+        others = [r for r in ranks_desc if r != pair]
+        for kickers in combinations(others, 3):
+            UNSUITED_LOOKUP[RANK_PRIMES[pair] ** 2 * _prime_product(kickers)] = rank
+            rank += 1
+
+
+_build_tables()
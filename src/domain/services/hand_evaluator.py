@@ -1,11 +1,55 @@
 """手牌评估服务"""
-from itertools import combinations
-from typing import List, Tuple
-from collections import Counter
+from itertools import combinations, islice
+from typing import Dict, List, Tuple
 
 from src.domain.enums import HandRank, Suit
 from src.domain.models.card import Card
 from src.domain.models.hand_value import HandValue
+from src.domain.services.cactus_tables import FLUSH_LOOKUP, UNSUITED_LOOKUP, MAX_HIGH_CARD
+
+
+# 2张手牌在前的7张牌中21种5张组合: (组合下标, 手牌部分掩码, 公共牌部分下标)
+_HOLE_BOARD_SPLITS: Tuple[Tuple[Tuple[int, ...], int, Tuple[int, ...]], ...] = tuple(
+    (
+        combo,
+        sum(1 << i for i in combo if i < 2),
+        tuple(i - 2 for i in combo if i >= 2)
+    )
+    for combo in combinations(range(7), 5)
+)
+
+# 顺子点数位掩码 -> 顺子最大点数（A-2-3-4-5 的最大点数为5）
+_STRAIGHT_HIGHS: Dict[int, int] = {0x1F << (high - 6): high for high in range(6, 15)}
+_STRAIGHT_HIGHS[0x100F] = 5
+
+# 花色位（Card.cactus 的 12-15 位）
+_SUIT_MASKS = (0x1000, 0x2000, 0x4000, 0x8000)
+
+
+def _best_combo_index(codes: List[int]) -> int:
+    """
+    找出最佳5张组合
+
+    参数:
+        codes: 各张牌的 Cactus-Kev 编码
+    返回:
+        int: 最佳组合在 combinations(codes, 5) 中的序号（并列时取第一个）
+    """
+    suits = [code & 0xF000 for code in codes]
+    if max(suits.count(mask) for mask in _SUIT_MASKS) >= 5:
+        ranks = [
+            FLUSH_LOOKUP[(c1 | c2 | c3 | c4 | c5) >> 16] if c1 & c2 & c3 & c4 & c5 & 0xF000
+            else UNSUITED_LOOKUP[(c1 & 0xFF) * (c2 & 0xFF) * (c3 & 0xFF) * (c4 & 0xFF) * (c5 & 0xFF)]
+            for c1, c2, c3, c4, c5 in combinations(codes, 5)
+        ]
+    else:
+        # 不可能成同花时只需素数积
+        primes = [code & 0xFF for code in codes]
+        ranks = [
+            UNSUITED_LOOKUP[p1 * p2 * p3 * p4 * p5]
+            for p1, p2, p3, p4, p5 in combinations(primes, 5)
+        ]
+    return ranks.index(min(ranks))
 
 
 class HandEvaluator:
@@ -27,14 +71,72 @@ class HandEvaluator:
         if len(cards) == 5:
             return HandEvaluator._evaluate_5_cards(cards)
 
-        # 从7张牌中选5张的最佳组合
-        best_value = None
-        for combo in combinations(cards, 5):
-            value = HandEvaluator._evaluate_5_cards(list(combo))
-            if best_value is None or value > best_value:
-                best_value = value
+        # 用 Cactus-Kev 查找表找出最佳5张组合，只对该组合构建 HandValue
+        index = _best_combo_index([card.cactus for card in cards])
+        if len(cards) == 7:
+            best_combo = _HOLE_BOARD_SPLITS[index][0]
+        else:
+            best_combo = next(islice(combinations(range(len(cards)), 5), index, None))
+        return HandEvaluator._evaluate_5_cards([cards[i] for i in best_combo])
 
-        return best_value
+    @staticmethod
+    def evaluate_hands(hands: List[List[Card]], board: List[Card]) -> List[HandValue]:
+        """
+        评估共用同一组公共牌的多手牌
+
+        公共牌各子集的花色与、点数或、素数积只计算一次，
+        每手牌的21种组合只需与手牌部分合并。
+
+        参数:
+            hands: 每名玩家的2张手牌
+            board: 5张公共牌
+        返回:
+            List[HandValue]: 与 hands 顺序一致的最佳牌型
+        """
+        if len(board) != 5 or any(len(hand) != 2 for hand in hands):
+            return [HandEvaluator.evaluate(hand + board) for hand in hands]
+
+        # 公共牌3/4/5张子集的部分结果: (花色与, 点数或, 素数积)
+        codes = [card.cactus for card in board]
+        board_parts = {}
+        for size in (3, 4, 5):
+            for indexes in combinations(range(5), size):
+                suit_and, rank_or, product = 0xF000, 0, 1
+                for i in indexes:
+                    suit_and &= codes[i]
+                    rank_or |= codes[i]
+                    product *= codes[i] & 0xFF
+                board_parts[indexes] = (suit_and, rank_or, product)
+
+        results = []
+        for hand in hands:
+            h1, h2 = hand[0].cactus, hand[1].cactus
+            # 手牌部分按掩码索引: 无 / 第1张 / 第2张 / 两张
+            hole_parts = (
+                (0xF000, 0, 1),
+                (h1, h1, h1 & 0xFF),
+                (h2, h2, h2 & 0xFF),
+                (h1 & h2, h1 | h2, (h1 & 0xFF) * (h2 & 0xFF)),
+            )
+            best_rank = MAX_HIGH_CARD + 1
+            best_combo = None
+            for combo, hole_mask, board_indexes in _HOLE_BOARD_SPLITS:
+                hole_and, hole_or, hole_product = hole_parts[hole_mask]
+                board_and, board_or, board_product = board_parts[board_indexes]
+                if hole_and & board_and & 0xF000:
+                    rank = FLUSH_LOOKUP[(hole_or | board_or) >> 16]
+                else:
+                    rank = UNSUITED_LOOKUP[hole_product * board_product]
+                if rank < best_rank:
+                    best_rank = rank
+                    best_combo = combo
+
+            # 组合下标 0/1 为手牌，2-6 为公共牌，直接取出5张，不拼接7张牌列表
+            results.append(HandEvaluator._evaluate_5_cards(
+                [hand[i] if i < 2 else board[i - 2] for i in best_combo]
+            ))
+
+        return results
 
     @staticmethod
     def _evaluate_5_cards(cards: List[Card]) -> HandValue:
@@ -43,31 +145,37 @@ class HandEvaluator:
             raise ValueError(f"Expected 5 cards, got {len(cards)}")
 
         # 排序（按点数降序）
-        sorted_cards = sorted(cards, key=lambda c: c.rank.num_value, reverse=True)
-        ranks = [c.rank.num_value for c in sorted_cards]
-        suits = [c.suit for c in sorted_cards]
-
-        # 统计点数出现次数
-        rank_counts = Counter(ranks)
-        count_values = sorted(rank_counts.values(), reverse=True)
-
-        # 检查同花
-        is_flush = len(set(suits)) == 1
-
-        # 检查顺子
-        is_straight = False
-        straight_high = 0
-        unique_ranks = sorted(set(ranks), reverse=True)
-
-        if len(unique_ranks) == 5:
-            # 普通顺子
-            if unique_ranks[0] - unique_ranks[4] == 4:
-                is_straight = True
-                straight_high = unique_ranks[0]
-            # A-2-3-4-5 特殊顺子（A视为1）
-            elif unique_ranks == [14, 5, 4, 3, 2]:
-                is_straight = True
-                straight_high = 5
+        sorted_cards = sorted(cards, key=lambda c: c.rank, reverse=True)
+        ranks = [c.rank for c in sorted_cards]
+
+        # 统计点数出现次数，按次数分组（组内点数降序，分组内为普通 int）
+        counts = [0] * 15
+        for r in ranks:
+            counts[r] += 1
+        quads = []
+        triples = []
+        pairs = []
+        singles = []
+        for r in range(14, 1, -1):
+            count = counts[r]
+            if count == 1:
+                singles.append(r)
+            elif count == 2:
+                pairs.append(r)
+            elif count == 3:
+                triples.append(r)
+            elif count == 4:
+                quads.append(r)
+
+        # 检查同花（五张牌的花色位按位与不为0）
+        c0, c1, c2, c3, c4 = cards
+        is_flush = (c0.cactus & c1.cactus & c2.cactus & c3.cactus & c4.cactus & 0xF000) != 0
+
+        # 检查顺子（五张牌的点数位按位或匹配顺子位掩码）
+        straight_high = _STRAIGHT_HIGHS.get(
+            (c0.cactus | c1.cactus | c2.cactus | c3.cactus | c4.cactus) >> 16, 0
+        )
+        is_straight = straight_high != 0
 
         # 判断牌型
         if is_straight and is_flush:
@@ -75,44 +183,34 @@ class HandEvaluator:
                 return HandValue(HandRank.ROYAL_FLUSH, (14,), sorted_cards)
             return HandValue(HandRank.STRAIGHT_FLUSH, (straight_high,), sorted_cards)
 
-        if count_values == [4, 1]:
+        if quads:
             # 四条
-            quad_rank = [r for r, c in rank_counts.items() if c == 4][0]
-            kicker = [r for r, c in rank_counts.items() if c == 1][0]
-            return HandValue(HandRank.FOUR_OF_KIND, (quad_rank, kicker), sorted_cards)
+            return HandValue(HandRank.FOUR_OF_KIND, (quads[0], singles[0]), sorted_cards)
 
-        if count_values == [3, 2]:
+        if triples and pairs:
             # 葫芦
-            triple_rank = [r for r, c in rank_counts.items() if c == 3][0]
-            pair_rank = [r for r, c in rank_counts.items() if c == 2][0]
-            return HandValue(HandRank.FULL_HOUSE, (triple_rank, pair_rank), sorted_cards)
+            return HandValue(HandRank.FULL_HOUSE, (triples[0], pairs[0]), sorted_cards)
 
         if is_flush:
-            return HandValue(HandRank.FLUSH, tuple(ranks), sorted_cards)
+            return HandValue(HandRank.FLUSH, tuple(singles), sorted_cards)
 
         if is_straight:
             return HandValue(HandRank.STRAIGHT, (straight_high,), sorted_cards)
 
-        if count_values == [3, 1, 1]:
+        if triples:
             # 三条
-            triple_rank = [r for r, c in rank_counts.items() if c == 3][0]
-            kickers = sorted([r for r, c in rank_counts.items() if c == 1], reverse=True)
-            return HandValue(HandRank.THREE_OF_KIND, (triple_rank,) + tuple(kickers), sorted_cards)
+            return HandValue(HandRank.THREE_OF_KIND, (triples[0], *singles), sorted_cards)
 
-        if count_values == [2, 2, 1]:
+        if len(pairs) == 2:
             # 两对
-            pairs = sorted([r for r, c in rank_counts.items() if c == 2], reverse=True)
-            kicker = [r for r, c in rank_counts.items() if c == 1][0]
-            return HandValue(HandRank.TWO_PAIR, tuple(pairs) + (kicker,), sorted_cards)
+            return HandValue(HandRank.TWO_PAIR, (pairs[0], pairs[1], singles[0]), sorted_cards)
 
-        if count_values == [2, 1, 1, 1]:
+        if pairs:
             # 一对
-            pair_rank = [r for r, c in rank_counts.items() if c == 2][0]
-            kickers = sorted([r for r, c in rank_counts.items() if c == 1], reverse=True)
-            return HandValue(HandRank.PAIR, (pair_rank,) + tuple(kickers), sorted_cards)
+            return HandValue(HandRank.PAIR, (pairs[0], *singles), sorted_cards)
 
         # 高牌
-        return HandValue(HandRank.HIGH_CARD, tuple(ranks), sorted_cards)
+        return HandValue(HandRank.HIGH_CARD, tuple(singles), sorted_cards)
 
     @staticmethod
     def get_hand_name(hand_value: HandValue) -> str:
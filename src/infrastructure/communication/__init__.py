@@ -1,4 +1,4 @@
 """通信模块"""
-from .connection_manager import ConnectionManager
+from .connection_manager import ConnectionManager, to_json
 
-__all__ = ['ConnectionManager']
+__all__ = ['ConnectionManager', 'to_json']
@@ -1,28 +1,94 @@
 """WebSocket连接管理器"""
-from typing import Dict, Any
+import asyncio
+import logging
+from collections import deque
+from typing import Deque, Dict, Any, Tuple, Union
 from fastapi import WebSocket
+import orjson
+
+logger = logging.getLogger(__name__)
+
+
+def to_json(data: Any) -> str:
+    """序列化为紧凑的JSON文本（WebSocket 以文本帧发送）"""
+    return orjson.dumps(data).decode("utf-8")
+
+
+class Outbox:
+    """单个连接的发送队列"""
+
+    def __init__(self):
+        # (是否为状态快照, 已序列化的消息)
+        self.messages: Deque[Tuple[bool, str]] = deque()
+        self.ready = asyncio.Event()
+
+    def put(self, text: str, snapshot: bool, max_size: int):
+        """消息入队，队列满时优先丢弃最旧的状态快照
+
+        游戏状态每次都是完整快照，丢弃积压的旧快照不会丢失状态，
+        聊天等增量消息只在队列里全是增量消息时才会被丢弃。
+        """
+        if len(self.messages) >= max_size:
+            for i, (is_snapshot, _) in enumerate(self.messages):
+                if is_snapshot:
+                    del self.messages[i]
+                    break
+            else:
+                self.messages.popleft()
+        self.messages.append((snapshot, text))
+        self.ready.set()
+
+    async def get(self) -> str:
+        """取出下一条消息，队列为空时等待"""
+        while not self.messages:
+            self.ready.clear()
+            await self.ready.wait()
+        return self.messages.popleft()[1]
 
 
 class ConnectionManager:
-    """WebSocket连接管理"""
+    """WebSocket连接管理
+
+    每个连接有独立的发送队列和唯一的发送任务，发送方法只负责序列化和入队，
+    各连接的写出并发进行，单个玩家网络变慢不会阻塞房间内其他玩家的更新。
+    """
+
+    # 每个连接的发送队列上限
+    SEND_QUEUE_SIZE = 32
 
     def __init__(self):
         # room_id -> {player_id -> websocket}
         self.connections: Dict[str, Dict[str, WebSocket]] = {}
+        # room_id -> ((player_id, websocket), ...)，连接变化时重建，供广播遍历
+        self._snapshots: Dict[str, Tuple[Tuple[str, WebSocket], ...]] = {}
+        # websocket -> 发送队列 / 发送任务
+        self._outboxes: Dict[WebSocket, Outbox] = {}
+        self._senders: Dict[WebSocket, asyncio.Task] = {}
 
     async def connect(self, room_id: str, player_id: str, websocket: WebSocket):
         """添加连接"""
         await websocket.accept()
         if room_id not in self.connections:
             self.connections[room_id] = {}
+        # 同一玩家重连时停止旧连接的发送任务
+        old_websocket = self.connections[room_id].get(player_id)
+        if old_websocket is not None:
+            self._stop_sender(old_websocket)
         self.connections[room_id][player_id] = websocket
+        self._snapshots[room_id] = tuple(self.connections[room_id].items())
+        self._start_sender(websocket)
 
     def disconnect(self, room_id: str, player_id: str):
         """移除连接"""
         if room_id in self.connections:
-            self.connections[room_id].pop(player_id, None)
-            if not self.connections[room_id]:
+            websocket = self.connections[room_id].pop(player_id, None)
+            if websocket is not None:
+                self._stop_sender(websocket)
+            if self.connections[room_id]:
+                self._snapshots[room_id] = tuple(self.connections[room_id].items())
+            else:
                 del self.connections[room_id]
+                self._snapshots.pop(room_id, None)
 
     def get_room_connections(self, room_id: str) -> Dict[str, WebSocket]:
         """获取房间所有连接"""
@@ -34,42 +100,72 @@ class ConnectionManager:
             return self.connections[room_id].get(player_id)
         return None
 
-    async def broadcast_to_room(self, room_id: str, message: dict):
-        """广播消息到房间所有玩家"""
-        connections = self.get_room_connections(room_id)
-        for websocket in connections.values():
-            try:
-                await websocket.send_json(message)
-            except Exception:
-                pass
+    # ============ 发送队列 ============
 
-    async def send_to_player(self, room_id: str, player_id: str, message: dict):
-        """发送消息给指定玩家"""
-        websocket = self.get_player_connection(room_id, player_id)
-        if websocket:
+    def _start_sender(self, websocket: WebSocket):
+        """为连接创建发送队列和发送任务"""
+        outbox = Outbox()
+        self._outboxes[websocket] = outbox
+        self._senders[websocket] = asyncio.create_task(self._sender_loop(websocket, outbox))
+
+    def _stop_sender(self, websocket: WebSocket):
+        """停止连接的发送任务"""
+        self._outboxes.pop(websocket, None)
+        task = self._senders.pop(websocket, None)
+        if task:
+            task.cancel()
+
+    async def _sender_loop(self, websocket: WebSocket, outbox: Outbox):
+        """按顺序发送队列中的消息，是该连接唯一的写入方"""
+        while True:
+            text = await outbox.get()
             try:
-                await websocket.send_json(message)
-            except Exception:
-                pass
+                await websocket.send_text(text)
+            except Exception as e:
+                # 连接已断开，剩余消息随发送队列一起丢弃
+                logger.debug("WebSocket发送失败，停止发送任务: %r", e)
+                return
+
+    def _enqueue(self, websocket: WebSocket, text: str, snapshot: bool = False):
+        """已序列化的消息入队"""
+        outbox = self._outboxes.get(websocket)
+        if outbox is not None:
+            outbox.put(text, snapshot, self.SEND_QUEUE_SIZE)
+
+    # ============ 消息发送 ============
 
-    async def send_personal_state(
+    def broadcast_to_room(self, room_id: str, message: dict):
+        """广播消息到房间所有玩家
+
+        所有玩家收到相同内容，消息只序列化一次，各连接共享同一份文本。
+        """
+        connections = self._snapshots.get(room_id)
+        if not connections:
+            return
+        text = to_json(message)
+        snapshot = message.get("type") == "game_state"
+        for _, websocket in connections:
+            self._enqueue(websocket, text, snapshot)
+
+    def send_to_player(
         self,
         room_id: str,
-        get_state_func,
-        additional_data: dict = None
+        player_id: str,
+        message: Union[dict, str],
+        snapshot: bool = False
     ):
-        """向房间内每个玩家发送个人视角的状态"""
-        connections = self.get_room_connections(room_id)
-        for player_id, websocket in connections.items():
-            try:
-                state = get_state_func(player_id)
-                if state:
-                    message = {"type": "game_state", "data": state}
-                    if additional_data:
-                        message["data"].update(additional_data)
-                    await websocket.send_json(message)
-            except Exception:
-                pass
+        """
+        发送消息给指定玩家
+
+        参数:
+            message: 消息，可以是已序列化的JSON文本
+            snapshot: 是否为完整的状态快照，积压时优先丢弃
+        """
+        websocket = self.get_player_connection(room_id, player_id)
+        if websocket:
+            if not isinstance(message, str):
+                message = to_json(message)
+            self._enqueue(websocket, message, snapshot)
 
     def is_connected(self, room_id: str, player_id: str) -> bool:
         """检查玩家是否已连接"""
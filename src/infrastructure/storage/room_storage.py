@@ -1,6 +1,6 @@
 """房间存储"""
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional
+from typing import Dict, Optional, Tuple
 from src.domain.models.poker_table import PokerTable
 
 
@@ -23,7 +23,7 @@ class RoomStorage(ABC):
         pass
 
     @abstractmethod
-    def list_all(self) -> List[PokerTable]:
+    def list_all(self) -> Tuple[PokerTable, ...]:
         """列出所有房间"""
         pass
 
@@ -38,10 +38,13 @@ class MemoryRoomStorage(RoomStorage):
 
     def __init__(self):
         self._rooms: Dict[str, PokerTable] = {}
+        # 房间列表缓存，房间增删时失效
+        self._cached_list: Optional[Tuple[PokerTable, ...]] = None
 
     def save(self, table: PokerTable) -> None:
         """保存房间"""
         self._rooms[table.room_id] = table
+        self._cached_list = None
 
     def get(self, room_id: str) -> Optional[PokerTable]:
         """获取房间"""
@@ -49,11 +52,14 @@ class MemoryRoomStorage(RoomStorage):
 
     def delete(self, room_id: str) -> None:
         """删除房间"""
-        self._rooms.pop(room_id, None)
-
-    def list_all(self) -> List[PokerTable]:
-        """列出所有房间"""
-        return list(self._rooms.values())
+        if self._rooms.pop(room_id, None) is not None:
+            self._cached_list = None
+
+    def list_all(self) -> Tuple[PokerTable, ...]:
+        """列出所有房间（返回不可变的缓存元组，调用方可直接共享）"""
+        if self._cached_list is None:
+            self._cached_list = tuple(self._rooms.values())
+        return self._cached_list
 
     def exists(self, room_id: str) -> bool:
         """检查房间是否存在"""
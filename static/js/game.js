@@ -151,17 +151,27 @@ function sendChat() {
 
 function handleMessage(message) {
     if (message.type === 'game_state') {
-        gameState = message.data;
+        gameState = mergeState(message.public, message.private);
         updateUI();
 
-        if (message.data.winners) {
-            showWinners(message.data.winners);
+        if (gameState.winners) {
+            showWinners(gameState.winners);
         }
     } else if (message.type === 'chat') {
         addChatMessage(message.data);
     }
 }
 
+// 合并公共状态和个人状态（自己的底牌和可用操作）
+function mergeState(publicState, privateState) {
+    const state = Object.assign({}, publicState, privateState);
+    state.players = publicState.players.map(player => {
+        if (player.id !== privateState.player_id) return player;
+        return Object.assign({}, player, { is_self: true, hand: privateState.hand });
+    });
+    return state;
+}
+
 // ============ UI 更新 ============
 
 function updateUI() {